@@ -8,13 +8,266 @@
 #              White pieces are displayed in black font on a light grey background.
 #              Black pieces are displayed in yellow font on a black background.
 
+import random
+
+# Colors are stored in the high nibble of a square byte: (color << 4) | piece_id
+WHITE = 0
+BLACK = 1
+COLOR_NAMES = ('white', 'black')
+COLOR_BITS = {'white': WHITE, 'black': BLACK}
+
+# Piece ids stored in the low nibble of a square byte, 0 means the square is empty
+EMPTY = 0
+PAWN = 1
+ROOK = 2
+KNIGHT = 3
+BISHOP = 4
+QUEEN = 5
+KING = 6
+FALCON = 7
+HUNTER = 8
+
+
+def _build_move_tables():
+    """
+    Precomputes, for every board index, a bitboard (an int with bit to_idx set) of the squares each piece type
+    can reach from that index on an empty board.
+    :return knight moves, king moves, bishop rays, rook rays, queen rays:
+    """
+    knight_moves = [0] * 64
+    king_moves = [0] * 64
+    bishop_rays = [0] * 64
+    rook_rays = [0] * 64
+    for from_idx in range(64):
+        from_row, from_col = divmod(from_idx, 8)
+        for to_idx in range(64):
+            to_row, to_col = divmod(to_idx, 8)
+            row_diff = abs(to_row - from_row)
+            col_diff = abs(to_col - from_col)
+            bit = 1 << to_idx
+            if (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2):
+                knight_moves[from_idx] |= bit
+            if max(row_diff, col_diff) == 1:
+                king_moves[from_idx] |= bit
+            if row_diff == col_diff and row_diff != 0:
+                bishop_rays[from_idx] |= bit
+            if (row_diff == 0) != (col_diff == 0):
+                rook_rays[from_idx] |= bit
+    queen_rays = [bishop_rays[idx] | rook_rays[idx] for idx in range(64)]
+    return knight_moves, king_moves, bishop_rays, rook_rays, queen_rays
+
+
+KNIGHT_MOVES, KING_MOVES, BISHOP_RAYS, ROOK_RAYS, QUEEN_RAYS = _build_move_tables()
+
+
+def _build_between_table():
+    """
+    Precomputes BETWEEN[from_idx][to_idx], a bitboard of the squares strictly between two board indexes that share
+    a row, column or diagonal. Indexes that are not lined up (e.g. a knight move) have nothing between them.
+    :return 64 x 64 list of bitboards:
+    """
+    between = [[0] * 64 for _ in range(64)]
+    for from_idx in range(64):
+        from_row, from_col = divmod(from_idx, 8)
+        for to_idx in range(64):
+            to_row, to_col = divmod(to_idx, 8)
+            row_diff = to_row - from_row
+            col_diff = to_col - from_col
+            if not (row_diff == 0 or col_diff == 0 or abs(row_diff) == abs(col_diff)):
+                continue
+            row_direction = (row_diff > 0) - (row_diff < 0)
+            col_direction = (col_diff > 0) - (col_diff < 0)
+            step = row_direction * 8 + col_direction
+            mask = 0
+            curr_idx = from_idx + step
+            while step and curr_idx != to_idx:
+                mask |= 1 << curr_idx
+                curr_idx += step
+            between[from_idx][to_idx] = mask
+    return between
+
+
+BETWEEN = _build_between_table()
+
+
+def _build_zobrist_table():
+    """
+    Seeds a random 64-bit key for every color, piece id and board index, ZOBRIST_PIECES[color][piece_id][idx].
+    Uses a fixed seed so hashes are the same from run to run.
+    :return nested list of zobrist keys:
+    """
+    rng = random.Random(42)
+    return [[[rng.getrandbits(64) for _ in range(64)] for _ in range(HUNTER + 1)] for _ in (WHITE, BLACK)]
+
+
+ZOBRIST_PIECES = _build_zobrist_table()
+
+
+def _hash_squares(squares):
+    """
+    Computes the zobrist hash of a full set of 64 square bytes from scratch.
+    :param squares: square bytes indexed by row * 8 + col
+    :return zobrist hash:
+    """
+    board_hash = 0
+    for idx, piece in enumerate(squares):
+        if piece != EMPTY:
+            board_hash ^= ZOBRIST_PIECES[piece >> 4][piece & 15][idx]
+    return board_hash
+
+# algebraic notation ('a1' - 'h8') -> zero-based (row, col) for the 64 squares on the board
+_SQUARE_INDEX = {file + rank: (int(rank) - 1, ord(file) - ord('a')) for file in 'abcdefgh' for rank in '12345678'}
+
+
+# The functions below are the move validation kernels. They only take and return ints, and the tables they read
+# are bound as default arguments so each lookup is a local variable access rather than a module global lookup.
+def _collision_check(occupancy, from_idx, to_idx, between=BETWEEN):
+    """
+    Returns True if none of the squares between the two board indexes are occupied.
+    :param occupancy: occupancy bitboard of the board
+    :param from_idx: board index of square piece is moving from
+    :param to_idx: board index of square piece is moving to
+    """
+    return (between[from_idx][to_idx] & occupancy) == 0
+
+
+# results returned by the move validators
+INVALID = 0
+VALID = 1
+PAWN_CAPTURE = 2
+
+
+def _validate_pawn(from_idx, to_idx, color, occupancy):
+    """
+    Can move forward 1 space vertically. If it is in the starting position it can move forward 2 spaces vertically.
+    It cannot capture by moving vertically, to capture a piece it must move forward diagonally. This is the
+    only time it can move forward diagonally.
+    :param from_idx: board index (row * 8 + col) the pawn is moving from
+    :param to_idx: board index (row * 8 + col) the pawn is moving to
+    :param color: WHITE or BLACK
+    :param occupancy: occupancy bitboard of the board
+    :return: INVALID if move is not valid
+    :return: PAWN_CAPTURE if the move is a diagonal capture move
+    :return: VALID if move is valid and not a capture
+    """
+    from_row, from_col = divmod(from_idx, 8)
+    to_row, to_col = divmod(to_idx, 8)
+
+    if color == BLACK:
+        direction = -1
+        start_row = 6
+    else:
+        direction = 1
+        start_row = 1
+
+    if from_col == to_col:
+        # pawns cannot capture by moving vertically
+        if occupancy & (1 << to_idx):
+            return INVALID
+        # regular pawn move, one row forward
+        elif to_row == from_row + direction:
+            return VALID
+        # starting pawn move, can move 2 rows forward
+        elif from_row == start_row and to_row == from_row + 2 * direction:
+            return VALID
+        else:
+            return INVALID
+    # capture move diagonal (left or right) and 1 row forward
+    elif abs(to_col - from_col) == 1 and to_row == from_row + direction:
+        if occupancy & (1 << to_idx):
+            return PAWN_CAPTURE
+        else:
+            return INVALID
+    else:
+        return INVALID
+
+
+def _validate_rook(from_idx, to_idx, color, occupancy, rays=ROOK_RAYS):
+    """
+    Can move either horizontally or vertically, forwards or backwards, an unlimited number of spaces.
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    # The rook can move vertically or horizontally as many spaces as it wants
+    return VALID if rays[from_idx] & (1 << to_idx) else INVALID
+
+
+def _validate_knight(from_idx, to_idx, color, occupancy, moves=KNIGHT_MOVES):
+    """
+    Can move 2 spaces vertically and 1 space horizontally or 2 spaces horizontally and 1 space vertically.
+    Can move forwards and backwards and can also hop over other pieces.
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    # Knight moves 2 columns over and 1 row over or 2 rows over and 1 column over in any direction
+    return VALID if moves[from_idx] & (1 << to_idx) else INVALID
+
+
+def _validate_bishop(from_idx, to_idx, color, occupancy, rays=BISHOP_RAYS):
+    """
+    Can move diagonally, both forwards and backwards, an unlimited number of spaces.
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    # bishop can move any number of rows and columns over, as long as num of rows = num of columns
+    return VALID if rays[from_idx] & (1 << to_idx) else INVALID
+
+
+def _validate_queen(from_idx, to_idx, color, occupancy, rays=QUEEN_RAYS):
+    """
+    Can move in any direction an unlimited number of spaces.
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    # queen can move like a bishop and rook combined
+    return VALID if rays[from_idx] & (1 << to_idx) else INVALID
+
+
+def _validate_king(from_idx, to_idx, color, occupancy, moves=KING_MOVES):
+    """
+    Can move in any direction but only by one space.
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    # king can move in any direction but only by one space
+    return VALID if moves[from_idx] & (1 << to_idx) else INVALID
+
+
+def _validate_falcon(from_idx, to_idx, color, occupancy):
+    """
+    Moves forward like a bishop and backward like a rook
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    row_diff = (to_idx >> 3) - (from_idx >> 3)
+    col_diff = (to_idx & 7) - (from_idx & 7)
+    # rows count up for white and down for black, so forward is a positive fwd for both colors
+    fwd = row_diff if color == WHITE else -row_diff
+    return VALID if (fwd > 0 and abs(row_diff) == abs(col_diff)) or (fwd < 0 and col_diff == 0) else INVALID
+
+
+def _validate_hunter(from_idx, to_idx, color, occupancy):
+    """
+    Moves forward like a rook and backward like a bishop.
+    :return: VALID if move is valid, INVALID otherwise
+    """
+    row_diff = (to_idx >> 3) - (from_idx >> 3)
+    col_diff = (to_idx & 7) - (from_idx & 7)
+    # rows count up for white and down for black, so forward is a positive fwd for both colors
+    fwd = row_diff if color == WHITE else -row_diff
+    return VALID if (fwd > 0 and col_diff == 0) or (fwd < 0 and abs(row_diff) == abs(col_diff)) else INVALID
+
+
+# move validator for each piece id, called as VALIDATORS[piece_id](from_idx, to_idx, color, occupancy)
+VALIDATORS = (None, _validate_pawn, _validate_rook, _validate_knight, _validate_bishop, _validate_queen,
+              _validate_king, _validate_falcon, _validate_hunter)
+
+
 class Piece:
     """
     Base class for all chess pieces. Represents a chess piece with its color and symbol.
     """
+    __slots__ = ('_color', '_glyph')
+    _symbol = None      # set by each subclass, shared by all of its instances
+
     def __init__(self, color):
         self._color = color
-        self._symbol = None
+        # white symbols are capitalized once here instead of on every get_symbol call
+        self._glyph = self._symbol.upper() if color == 'white' else self._symbol
 
     def get_color(self):
         '''
@@ -28,362 +281,166 @@ class Piece:
         If a piece is white the symbol is capitalized.
         If a piece is black the symbol is lowercase.
         '''
-        if self._color == 'white':
-            return self._symbol.upper()
-        else:
-            return self._symbol
+        return self._glyph
 
 
 class Pawn(Piece):
     """
-    Represents a pawn chess piece and the allowed moves it can make.
+    Represents a pawn chess piece.
     """
-    def __init__(self, color):
-        """
-        initializes a pawn chess piece with symbol 'p'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'p'
-
-    def valid_move(self, from_square, to_square):
-        '''
-        Can move forward 1 space vertically. If it is in the starting position it can move forward 2 spaces vertically.
-        It cannot capture by moving vertically, to capture a piece it must move forward diagonally. This is the
-        only time it can move forward diagonally.
-        :param from_square:
-        :param to_square:
-        :return: False if move is not valid
-        :return: 'pawn_capture' if the move is a diagonal capture move
-        :return: True if move is valid and not a capture
-    '''
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        if self.get_color() == 'black':
-            direction = -1
-            start_row = 6
-        else:
-            direction = 1
-            start_row = 1
-
-        if from_col == to_col:
-            # regular pawn move, one row forward
-            if to_row == from_row + direction:
-                return True
-            # starting pawn move, can move 2 rows forward
-            elif from_row == start_row and to_row == from_row + 2 * direction:
-                return True
-            else:
-                return False
-        # capture move diagonal (left or right) and 1 row forward
-        elif abs(to_col - from_col) == 1 and to_row == from_row + direction:
-            if to_square.get_piece() == self.get_color():
-                return False
-            elif to_square.get_piece() is None:
-                return False
-            else:
-                return 'pawn_capture'
-        else:
-            return False
+    __slots__ = ()
+    _symbol = 'p'
 
 
 class Rook(Piece):
     """
-    Represents a rook chess piece and the allowed moves it can make.
+    Represents a rook chess piece.
     """
-    def __init__(self, color):
-        """
-        initializes a rook chess piece with symbol 'r'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'r'
-
-    def valid_move(self, from_square, to_square):
-        """
-        Can move either horizontally or vertically, forwards or backwards, an unlimited number of spaces.
-        :param from_square:
-        :param to_square:
-        :return: False if move is invalid
-        :return: True if move is valid
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        # The rook can move vertically or horizontally as many spaces as it wants
-        if from_row == to_row and from_col != to_col:
-            return True
-        elif from_row != to_row and from_col == to_col:
-            return True
-        else:
-            return False
+    __slots__ = ()
+    _symbol = 'r'
 
 
 class Knight(Piece):
     """
-    Represents a knight chess piece and valid moves it can make.
+    Represents a knight chess piece.
     """
-    def __init__(self, color):
-        """
-        initializes a knight chess piece with symbol 'n'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'n'
-
-    def valid_move(self, from_square, to_square):
-        """
-        Can move 2 spaces vertically and 1 space horizontally or 2 spaces horizontally and 1 space vertically.
-        Can move forwards and backwards and can also hop over other pieces.
-        :param from_square:
-        :param to_square:
-        :return: False if move is invalid
-        :return: True if move is valid
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        # Knight moves 2 columns over and 1 row over or 2 rows over and 1 column over in any direction
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-        if (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2):
-            return True
-        else:
-            return False
+    __slots__ = ()
+    _symbol = 'n'
 
 
 class Bishop(Piece):
     """
     Represents a bishop chess piece.
     """
-    def __init__(self, color):
-        """
-        initializes a bishop chess piece with symbol 'b'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'b'
-
-    def valid_move(self, from_square, to_square):
-        """
-        Can move diagonally, both forwards and backwards, an unlimited number of spaces.
-        :param from_square:
-        :param to_square:
-        :return: False if move is invalid
-        :return: True if move is valid
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        # bishop can move any number of rows and columns over, as long as num of rows = num of columns
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-        if row_diff == col_diff:
-            return True
-        else:
-            return False
+    __slots__ = ()
+    _symbol = 'b'
 
 
 class Queen(Piece):
     """
     Represents a queen chess piece.
     """
-    def __init__(self, color):
-        """
-        initializes a queen chess piece with symbol 'q'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'q'
-
-    def valid_move(self, from_square, to_square):
-        """
-        Can move in any direction an unlimited number of spaces.
-        :param from_square:
-        :param to_square:
-        :return: False if invalid move
-        :return: True if move is valid
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-
-        # queen can move like a bishop and rook combined
-        if row_diff == col_diff:
-            return True
-        elif from_row == to_row and from_col != to_col:
-            return True
-        elif from_row != to_row and from_col == to_col:
-            return True
-        else:
-            return False
+    __slots__ = ()
+    _symbol = 'q'
 
 
 class King(Piece):
     """
     Represents a king chess piece.
     """
-    def __init__(self, color):
-        """
-        initializes a king chess piece with symbol 'k'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'k'
-
-    def valid_move(self, from_square, to_square):
-        """
-        Can move in any direction but only by one space.
-        :param from_square:
-        :param to_square:
-        :return: False if invalid move
-        :return: True if move is valid
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        # king can move in any direction but only by one space
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-
-        if row_diff <= 1 and col_diff <= 1:
-            return True
-        else:
-            return False
+    __slots__ = ()
+    _symbol = 'k'
 
 
 class Falcon(Piece):
     """
     Represents a Falcon fairy chess piece - special variant of chess
     """
-    def __init__(self, color):
-        """
-        initializes a Falcon chess piece with symbol 'f'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'f'
-
-    def valid_move(self, from_square, to_square):
-        """
-        Moves forward like a bishop and backward like a rook
-        :param from_square:
-        :param to_square:
-        :return: False if invalid move
-        :return: True if move is valid
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        row_diff = to_row - from_row
-        col_diff = to_col - from_col
-
-        if self.get_color() == 'white':
-            if row_diff >= 0:
-                if abs(row_diff) == abs(col_diff):
-                    return True
-                else:
-                    return False
-            else:
-                if from_row == to_row and from_col != to_col:
-                    return True
-                else:
-                    return False
-        else:
-            if row_diff <= 0:
-                if abs(row_diff) == abs(col_diff):
-                    return True
-                else:
-                    return False
-            else:
-                if from_col == to_col and from_row != to_row:
-                    return True
-                else:
-                    return False
+    __slots__ = ()
+    _symbol = 'f'
 
 
 class Hunter(Piece):
     """
     Represents a Hunter fairy chess piece - special variant of chess.
     """
-    def __init__(self, color):
-        """
-        initializes a hunter chess piece with symbol 'h'
-        :param color:
-        """
-        super().__init__(color)
-        self._symbol = 'h'
+    __slots__ = ()
+    _symbol = 'h'
 
-    def valid_move(self, from_square, to_square):
-        """
-        Moves forward like a rook and backward like a bishop.
-        :param from_square:
-        :param to_square:
-        :return False if invalid move:
-        :return True if move is valid:
-        """
-        from_row = from_square.get_row()
-        from_col = from_square.get_col()
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-        row_diff = to_row - from_row
-        col_diff = to_col - from_col
 
-        if self.get_color() == 'black':
-            if row_diff >= 0:
-                if abs(row_diff) == abs(col_diff):
-                    return True
-                else:
-                    return False
-            else:
-                if from_row == to_row and from_col != to_col:
-                    return True
-                else:
-                    return False
+def _build_piece_objects():
+    """
+    Builds one shared piece object for every square byte that encodes a piece, indexed by the byte itself.
+    Bytes that do not encode a piece map to None.
+    :return tuple of piece objects:
+    """
+    piece_types = (None, Pawn, Rook, Knight, Bishop, Queen, King, Falcon, Hunter)
+    piece_objects = [None] * 32
+    for color in (WHITE, BLACK):
+        for piece_id in range(PAWN, HUNTER + 1):
+            piece_objects[(color << 4) | piece_id] = piece_types[piece_id](COLOR_NAMES[color])
+    return tuple(piece_objects)
+
+
+# singleton piece objects used for captured piece tracking, PIECE_OBJECTS[square byte] -> piece or None
+PIECE_OBJECTS = _build_piece_objects()
+
+
+def _build_glyph_table():
+    """
+    Builds the text print_board shows for every possible square byte, including the color escape codes and the
+    trailing space. White pieces are in black font on a light grey background, black pieces are in yellow font on a
+    black background and empty squares are shown as '.'.
+    :return list of 256 strings:
+    """
+    glyphs = [". "] * 256
+    for piece_byte, piece in enumerate(PIECE_OBJECTS):
+        if piece is None:
+            continue
+        if piece.get_color() == 'black':
+            glyphs[piece_byte] = "\033[1;33;40m" + piece.get_symbol() + "\033[0m "
         else:
-            if row_diff <= 0:
-                if abs(row_diff) == abs(col_diff):
-                    return True
-                else:
-                    return False
-            else:
-                if from_col == to_col and from_row != to_row:
-                    return True
-                else:
-                    return False
+            glyphs[piece_byte] = "\033[0;30;47m" + piece.get_symbol() + "\033[0m "
+    return glyphs
+
+
+# text printed for each square byte, _GLYPH[square byte] -> string
+_GLYPH = _build_glyph_table()
+
+
+# square bytes of the starting position, row 1 (white's back rank) first
+_INITIAL_BOARD = bytes((
+    0x02, 0x03, 0x04, 0x05, 0x06, 0x04, 0x03, 0x02,
+    0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x11, 0x11,
+    0x12, 0x13, 0x14, 0x15, 0x16, 0x14, 0x13, 0x12,
+))
+# rows 1, 2, 7 and 8 are occupied at the start
+_INITIAL_OCCUPANCY = 0xFFFF00000000FFFF
+_INITIAL_HASH = _hash_squares(_INITIAL_BOARD)
+
+
+# bits of Player._fairy_mask, set while the fairy piece is still in reserve
+HAS_F = 1
+HAS_H = 2
+_FAIRY_BITS = {'f': HAS_F, 'h': HAS_H}
 
 
 class Player:
     """
     Represents a player of the chess game.
     """
+    __slots__ = ('_color', '_captured', '_fairy_mask', '_fairy_played_count', '_major_caps')
+
     def __init__(self, color):
         '''
         initializes a player object with a color, list of pieces captured from their opponent, and fairy pieces
         in reserve.
-        :param color:
+        :param color: WHITE or BLACK
         '''
         self._color = color
         self._captured = []
-        self._fairy_pieces = ['h', 'f']
+        self._fairy_mask = HAS_F | HAS_H
         self._fairy_played_count = 0
+        self._major_caps = 0
+
+    def copy_fast(self):
+        '''
+        returns a copy of the player, the captured list is copied but the shared piece objects in it are not
+        '''
+        player = Player.__new__(Player)
+        player._color = self._color
+        player._captured = self._captured[:]
+        player._fairy_mask = self._fairy_mask
+        player._fairy_played_count = self._fairy_played_count
+        player._major_caps = self._major_caps
+        return player
+
+    __copy__ = copy_fast
 
     def get_captured_pieces(self):
         '''
@@ -393,15 +450,22 @@ class Player:
 
     def get_fairy_pieces(self):
         '''
-        returns the fairy pieces a player has in reserve
+        returns the fairy pieces a player has in reserve as a bitmask of HAS_F and HAS_H
+        '''
+        return self._fairy_mask
+
+    def has_fairy_piece(self, piece):
+        '''
+        returns True if the fairy piece ('f' or 'h') is still in reserve
+        :param piece:
         '''
-        return self._fairy_pieces
+        return bool(self._fairy_mask & _FAIRY_BITS.get(piece, 0))
 
     def get_color(self):
         '''
-        returns the player color
+        returns the player color ('white' or 'black')
         '''
-        return self._color
+        return COLOR_NAMES[self._color]
 
     def add_captured(self, piece):
         '''
@@ -412,10 +476,10 @@ class Player:
 
     def remove_fairy_piece(self, piece):
         '''
-        removes a fairy piece from the fairy_piece list if it is brought into play.
+        removes a fairy piece ('f' or 'h') from the reserve if it is brought into play.
         :param piece:
         '''
-        self._fairy_pieces.remove(piece)
+        self._fairy_mask &= ~_FAIRY_BITS[piece]
 
     def get_fairy_played_count(self):
         '''
@@ -429,123 +493,95 @@ class Player:
         '''
         self._fairy_played_count += 1
 
-
-class Square:
-    """
-    Represents a square on the chess board and any chess pieces on it as well as the row and column of its location.
-    """
-    def __init__(self, col, row):
-        """
-        initializes a square object with a column and row value indicating position on a grid.
-        :param col:
-        :param row:
-        """
-        self._piece = None
-        self._row = row
-        self._col = col
-
-    def get_piece(self):
+    def get_major_caps(self):
         '''
-        returns piece on square
-        '''
-        return self._piece
-
-    def get_row(self):
-        '''
-        returns the row of the square
-        '''
-        return self._row
-
-    def get_col(self):
-        '''
-        returns the column of the square
-        '''
-        return self._col
-
-    def add_piece(self, piece):
-        '''
-        adds a piece object onto a square
-        :param piece:
+        returns count of rooks, knights, bishops and queens the player has captured
         '''
-        self._piece = piece
+        return self._major_caps
 
-    def remove_piece(self):
+    def inc_major_caps(self):
         '''
-        removes a piece from a square, replacing it with None
+        increments the count of rooks, knights, bishops and queens captured
         '''
-        self._piece = None
+        self._major_caps += 1
 
 
 class Board:
     """
-    Represents the chess board with squares and pieces on it.
+    Represents the chess board as a flat bytearray of 64 squares, indexed by row * 8 + col.
+    Each byte encodes the piece on the square as (color << 4) | piece_id, 0 means the square is empty.
     """
+    __slots__ = ('_squares', '_occupancy', '_hash')
+
     def __init__(self):
         '''
-        Generates a grid representing the chess board and populates it with square objects that have a row and column
-        coordinate as well as the chess pieces in their initial positions.
-        '''
-        self._board = []
-        for column in range(8):
-            row = []
-            for grid in range(8):
-                row.append(Square(grid, column))
-            self._board.append(row)
-
-        # Place pieces in initial position on the board
-        self.place_piece(Rook('white'), 0, 0)  # Rook
-        self.place_piece(Knight('white'), 0, 1)  # Knight
-        self.place_piece(Bishop('white'), 0, 2)  # Bishop
-        self.place_piece(Queen('white'), 0, 3)  # Queen
-        self.place_piece(King('white'), 0, 4)  # King
-        self.place_piece(Bishop('white'), 0, 5)  # Bishop
-        self.place_piece(Knight('white'), 0, 6)  # Knight
-        self.place_piece(Rook('white'), 0, 7)  # Rook
-        self.place_piece(Pawn('white'), 1, 0)  # Pawn
-        self.place_piece(Pawn('white'), 1, 1)  # Pawn
-        self.place_piece(Pawn('white'), 1, 2)  # Pawn
-        self.place_piece(Pawn('white'), 1, 3)  # Pawn
-        self.place_piece(Pawn('white'), 1, 4)  # Pawn
-        self.place_piece(Pawn('white'), 1, 5)  # Pawn
-        self.place_piece(Pawn('white'), 1, 6)  # Pawn
-        self.place_piece(Pawn('white'), 1, 7)  # Pawn
-
-        self.place_piece(Rook('black'), 7, 0)  # Rook
-        self.place_piece(Knight('black'), 7, 1)  # Knight
-        self.place_piece(Bishop('black'), 7, 2)  # Bishop
-        self.place_piece(Queen('black'), 7, 3)  # Queen
-        self.place_piece(King('black'), 7, 4)  # King
-        self.place_piece(Bishop('black'), 7, 5)  # Bishop
-        self.place_piece(Knight('black'), 7, 6)  # Knight
-        self.place_piece(Rook('black'), 7, 7)  # Rook
-        self.place_piece(Pawn('black'), 6, 0)  # Pawn
-        self.place_piece(Pawn('black'), 6, 1)  # Pawn
-        self.place_piece(Pawn('black'), 6, 2)  # Pawn
-        self.place_piece(Pawn('black'), 6, 3)  # Pawn
-        self.place_piece(Pawn('black'), 6, 4)  # Pawn
-        self.place_piece(Pawn('black'), 6, 5)  # Pawn
-        self.place_piece(Pawn('black'), 6, 6)  # Pawn
-        self.place_piece(Pawn('black'), 6, 7)  # Pawn
-
-    def get_square(self, row, col):
-        """
-        returns square object at location given by row and column
-        :param row:
-        :param col:
-        :return square:
-        """
-        return self._board[row][col]
-
-    def place_piece(self, piece, row, col):
-        """
-        places a piece object onto a square object on the board
-        :param piece:
-        :param row:
-        :param col:
+        Generates the 64 square board and places the chess pieces in their initial positions.
+        '''
+        self._squares = bytearray(_INITIAL_BOARD)
+        self._occupancy = _INITIAL_OCCUPANCY
+        self._hash = _INITIAL_HASH
+
+    def copy_fast(self):
+        """
+        returns a copy of the board, the 64 square bytes are copied with a single slice
+        """
+        board = Board.__new__(Board)
+        board._squares = self._squares[:]
+        board._occupancy = self._occupancy
+        board._hash = self._hash
+        return board
+
+    __copy__ = copy_fast
+
+    def get_squares(self):
+        """
+        returns the bytearray of square bytes making up the board
+        """
+        return self._squares
+
+    def get_occupancy(self):
+        """
+        returns the occupancy bitboard, bit idx is set when the square at board index idx holds a piece
+        """
+        return self._occupancy
+
+    def hash(self):
+        """
+        returns the zobrist hash of the pieces on the board, updated incrementally as pieces are placed and removed.
+        It does not include whose turn it is.
+        """
+        return self._hash
+
+    def get_piece(self, idx):
+        """
+        returns the piece object on the square at the board index given, None if the square is empty
+        :param idx: board index (row * 8 + col)
+        :return piece:
+        """
+        return PIECE_OBJECTS[self._squares[idx]]
+
+    def place_piece(self, piece, idx):
+        """
+        places a piece onto an empty square on the board
+        :param piece: square byte encoding the piece, (color << 4) | piece_id
+        :param idx: board index (row * 8 + col)
         :return:
         """
-        square = self._board[row][col]
-        square.add_piece(piece)
+        self._squares[idx] = piece
+        self._occupancy ^= 1 << idx
+        self._hash ^= ZOBRIST_PIECES[piece >> 4][piece & 15][idx]
+
+    def remove_piece(self, idx):
+        """
+        removes a piece from a square, leaving it empty
+        :param idx: board index (row * 8 + col)
+        :return square byte of the piece removed:
+        """
+        piece = self._squares[idx]
+        self._squares[idx] = EMPTY
+        self._occupancy ^= 1 << idx
+        self._hash ^= ZOBRIST_PIECES[piece >> 4][piece & 15][idx]
+        return piece
 
     def print_board(self):
         '''
@@ -557,27 +593,70 @@ class Board:
         header = "  |----------------|"
         print(label_col)
         print(header)
+        squares = self._squares
         for row in range(0, 8):
-            print(str(row+1) + ' |', end="")
-            for col in range(8):
-                piece = self._board[row][col].get_piece()
-                if piece is not None:
-                    if piece.get_color() == 'black':
-                        print("\033[1;33;40m" + piece.get_symbol() + "\033[0m", end=" ")
-                    else:
-                        print("\033[0;30;47m" + piece.get_symbol() + "\033[0m", end=" ")
-                else:
-                    print(".", end=" ")
-            print('| ' + str(row+1))
+            row_glyphs = ''.join([_GLYPH[squares[idx]] for idx in range(row * 8, row * 8 + 8)])
+            print(str(row+1) + ' |' + row_glyphs + '| ' + str(row+1))
         print(header)
         print(label_col)
 
 
+class CacheTable:
+    """
+    Fixed size table for memoizing results by board hash. The size is a power of two so a hash maps to its slot
+    with hash & (size - 1). A new entry replaces whatever was stored in its slot.
+    """
+    __slots__ = ('_mask', '_keys', '_values')
+
+    def __init__(self, size=1 << 16):
+        """
+        initializes an empty table with the given number of slots
+        :param size: number of slots, must be a power of two
+        """
+        if size <= 0 or size & (size - 1):
+            raise ValueError("CacheTable size must be a power of two")
+        self._mask = size - 1
+        self._keys = [None] * size
+        self._values = [None] * size
+
+    def get(self, key, default=None):
+        """
+        returns the value stored for the hash given, default if it is not in the table
+        :param key: board hash
+        :param default:
+        :return value:
+        """
+        slot = key & self._mask
+        if self._keys[slot] == key:
+            return self._values[slot]
+        return default
+
+    def put(self, key, value):
+        """
+        stores a value for the hash given, replacing the entry in its slot
+        :param key: board hash
+        :param value:
+        """
+        slot = key & self._mask
+        self._keys[slot] = key
+        self._values[slot] = value
+
+    def clear(self):
+        """
+        removes every entry from the table
+        """
+        size = self._mask + 1
+        self._keys = [None] * size
+        self._values = [None] * size
+
+
 class ChessVar:
     """
     Represents the ChessVar game. Manages the game including turn order, moves, captures and game state.
     White player starts with the first move.
     """
+    __slots__ = ('_board', '_game_state', '_players', '_curr')
+
     def __init__(self):
         '''
         initializes a new game with the board, game state, and both players.
@@ -585,8 +664,8 @@ class ChessVar:
         '''
         self._board = Board()
         self._game_state = 'UNFINISHED'
-        self._players = {'white': Player('white'), 'black': Player('black')}
-        self._curr_player = self._players['white']
+        self._players = (Player(WHITE), Player(BLACK))     # indexed by color
+        self._curr = WHITE
 
     def get_board(self):
         '''
@@ -606,7 +685,7 @@ class ChessVar:
         '''
         Changes game state from 'UNFINISHED' to "BLACK_WON" or "WHITE_WON when called"
         '''
-        if self._curr_player.get_color() == 'white':
+        if self._curr == WHITE:
             self._game_state = 'WHITE_WON'
             print(self.get_game_state())
             raise GameOver("This game is over.")
@@ -619,166 +698,121 @@ class ChessVar:
         '''
         Called after a valid move has been made. Switches turn to next player.
         '''
-        if self._curr_player.get_color() == 'white':
-            self._curr_player = self._players['black']
-        else:
-            self._curr_player = self._players['white']
+        self._curr ^= 1
 
     def get_current_player(self):
         '''
         Returns the current player (white or black)
         '''
-        return self._curr_player
+        return self._players[self._curr]
 
     def get_player(self, color):
         """
         Returns the player object of the color specified.
-        :param color:
+        :param color: 'white' or 'black'
         :return player:
         """
-        return self._players[color]
+        return self._players[COLOR_BITS[color]]
+
+    def snapshot(self):
+        """
+        Returns a copy of the game state that can be passed to restore to undo any moves made since.
+        :return snapshot:
+        """
+        players = (self._players[WHITE].copy_fast(), self._players[BLACK].copy_fast())
+        return self._board.copy_fast(), self._game_state, players, self._curr
+
+    def restore(self, snapshot):
+        """
+        Returns the game to the state saved by snapshot. The snapshot is copied, so it can be restored again later.
+        :param snapshot: value returned by snapshot
+        """
+        board, game_state, players, curr = snapshot
+        self._board = board.copy_fast()
+        self._game_state = game_state
+        self._players = (players[WHITE].copy_fast(), players[BLACK].copy_fast())
+        self._curr = curr
 
     def make_move(self, from_square_str, to_square_str):
         """
         Determines if a move on the board is valid, if it is the move is made and opponent pieces are captured if
         applicable.
-        :param from_square_str: string representing the square object the object is moving from
-        :param to_square_str: string representing the square object the object is moving to
+        :param from_square_str: string representing the square the piece is moving from
+        :param to_square_str: string representing the square the piece is moving to
         :return True if the move is made successfully:
         :return False if move violates rules:
         """
-        # converts string representation and adjusts for zero-based indexing to convert to square objects
-        col_dict = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}
-        from_row = int(from_square_str[1]) - 1
-        from_col = col_dict[from_square_str[0]]
-        to_row = int(to_square_str[1]) - 1
-        to_col = col_dict[to_square_str[0]]
+        # converts string representation to zero-based (row, col), None if the square is not on the board
+        from_square = _SQUARE_INDEX.get(from_square_str)
+        to_square = _SQUARE_INDEX.get(to_square_str)
 
         # checks if piece moved off board
-        if to_row > 7 or to_col > 7 or to_row < 0 or to_col < 0:
+        if from_square is None or to_square is None:
             return False
 
-        to_square = self._board.get_square(to_row, to_col)
-        from_square = self._board.get_square(from_row, from_col)
-        moving_piece = from_square.get_piece()
+        from_idx = from_square[0] * 8 + from_square[1]
+        to_idx = to_square[0] * 8 + to_square[1]
+        squares = self._board.get_squares()
+        piece = squares[from_idx]
+        target = squares[to_idx]
 
-        # checks to see if player is moving their own piece
-        if moving_piece is None:
+        # checks to see if player is moving their own piece and is not landing on their own piece
+        own_color = self._curr
+        if piece == EMPTY or piece >> 4 != own_color:
             return False
-        if moving_piece.get_color() != self._curr_player.get_color():
+        if target != EMPTY and target >> 4 == own_color:
             return False
 
         # checks if move violates rules of piece
-        if moving_piece.valid_move(from_square, to_square) is False:
+        occupancy = self._board.get_occupancy()
+        if VALIDATORS[piece & 15](from_idx, to_idx, own_color, occupancy) == INVALID:
             return False
 
-        # skips collision checking for knights since they can hop other pieces
-        if isinstance(moving_piece, Knight):
-            # moves to an empty square if passes all tests
-            if to_square.get_piece() is None:
-                self.move_process(moving_piece, from_square, to_square)
-                return True
-            # captures piece and moves to that square if it lands on an opponent's piece
-            elif to_square.get_piece().get_color != from_square.get_piece().get_color():
-                self.capture_piece(to_square)
-                self.move_process(moving_piece, from_square, to_square)
-                return True
-            else:
-                return False
-
-        # adjusts captures for pawns so only diagonal moves can capture opponent's pieces
-        # and initial 2 square move can hop other pieces
-        elif isinstance(moving_piece, Pawn):
-            if self.collision_check(to_row, to_col, from_row, from_col) is False:
-                return False
-            # moves piece to an empty square if it passes all tests
-            if to_square.get_piece() is None:
-                self.move_process(moving_piece, from_square, to_square)
-                return True
-            # captures opponent piece and moves to that square only if it is a diagonal move
-            elif moving_piece.get_color() != to_square.get_piece().get_color() \
-                    and moving_piece.valid_move(from_square, to_square) == 'pawn_capture':
-                self.capture_piece(to_square)
-                self.move_process(moving_piece, from_square, to_square)
-            else:
-                return False
+        # checks for collisions with pieces in path of moving piece, a knight move has no squares in its path
+        if not _collision_check(occupancy, from_idx, to_idx):
+            return False
 
-        # checks for collisions with pieces in path of moving piece for all pieces except knights and pawns
-        else:
-            if self.collision_check(to_row, to_col, from_row, from_col) is False:
-                return False
-            # moves piece to an empty square if it passes all tests
-            if to_square.get_piece() is None:
-                self.move_process(moving_piece, from_square, to_square)
-                return True
-            # captures piece if it passes tests and lands on an opponent's piece
-            elif moving_piece.get_color() != to_square.get_piece().get_color():
-                self.capture_piece(to_square)
-                self.move_process(moving_piece, from_square, to_square)
-                return True
-            else:
-                return False
+        # captures piece if it lands on an opponent's piece, the pawn validator only allows this diagonally
+        if target != EMPTY:
+            self.capture_piece(to_idx)
+        self.move_process(from_idx, to_idx)
+        return True
 
-    def collision_check(self, to_row, to_col, from_row, from_col):
+    def collision_check(self, from_idx, to_idx):
         """
         Returns false if a collision with another piece occurs, violating game rules.
-        :param to_row: row value of square piece is moving to
-        :param to_col: column value of square piece is moving to
-        :param from_row: row value of square piece is moving from
-        :param from_col: column value of square piece is moving from
+        A move is collision free when none of the squares between the two board indexes are occupied.
+        :param from_idx: board index of square piece is moving from
+        :param to_idx: board index of square piece is moving to
         :return false if a collision with another piece occurs:
         """
-        if to_row == from_row:
-            row_direction = 0
-        elif to_row > from_row:
-            row_direction = 1
-        else:
-            row_direction = -1
-
-        if to_col == from_col:
-            col_direction = 0
-        elif to_col > from_col:
-            col_direction = 1
-        else:
-            col_direction = -1
-
-        curr_row = from_row + row_direction
-        curr_col = from_col + col_direction
-        while curr_row != to_row or curr_col != to_col:
-            curr_square = self._board.get_square(curr_row, curr_col)
-            if curr_square.get_piece() is not None:
-                return False
-            curr_row += row_direction
-            curr_col += col_direction
+        return _collision_check(self._board.get_occupancy(), from_idx, to_idx)
 
-    def move_process(self, moving_piece, from_square, to_square):
+    def move_process(self, from_idx, to_idx):
         """
         Moves a piece from one square to another and removes it from the starting square.
-        :param moving_piece: piece object being moved
-        :param from_square: square object piece is moving from
-        :param to_square: square object piece is moving to
+        :param from_idx: board index of square piece is moving from
+        :param to_idx: board index of square piece is moving to
         :return:
         """
-        to_row = to_square.get_row()
-        to_col = to_square.get_col()
-
-        self._board.place_piece(moving_piece, to_row, to_col)
-        from_square.remove_piece()
+        self._board.place_piece(self._board.remove_piece(from_idx), to_idx)
         self.get_game_state()
         self.change_turn()
 
-    def capture_piece(self, square):
+    def capture_piece(self, idx):
         """
         Captures an opponents piece and moves it into the player's captured pieces list
-        :param square:
+        :param idx: board index of the square the captured piece is on
         :return:
         """
-        cap_piece = square.get_piece()
-        if isinstance(cap_piece, King):         # changes game state if a king is captured
+        cap_piece = self._board.get_squares()[idx]
+        if cap_piece & 15 == KING:         # changes game state if a king is captured
             self.change_game_state()
         curr_player = self.get_current_player()
-        curr_player.add_captured(cap_piece)
-        square.remove_piece()
+        curr_player.add_captured(PIECE_OBJECTS[cap_piece])
+        if ROOK <= cap_piece & 15 <= QUEEN:     # rook, knight, bishop or queen
+            curr_player.inc_major_caps()
+        self._board.remove_piece(idx)
 
     def enter_fairy_piece(self, piece_symbol, square_str):
         """
@@ -790,36 +824,32 @@ class ChessVar:
         """
         # need to check to see if a rook, knight, queen, bishop was captured in the square during
         # last turn.
-        col_dict = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}
-        sq_row = int(square_str[1]) - 1
-        sq_col = col_dict[square_str[0]]
-        square = self._board.get_square(sq_row, sq_col)
+        square = _SQUARE_INDEX.get(square_str)
+        if square is None:
+            return False
+        sq_row, sq_col = square
+        sq_idx = sq_row * 8 + sq_col
+        squares = self._board.get_squares()
         curr_player = self.get_current_player()
-        replace_piece = ['n', 'r', 'b', 'q']
-        major_pieces_cap_count = 0
 
-        if piece_symbol.lower() not in curr_player.get_fairy_pieces():
+        if not curr_player.has_fairy_piece(piece_symbol.lower()):
             return False
 
         # for white fairy piece entering play
-        if curr_player.get_color() == 'white':
+        if self._curr == WHITE:
             if piece_symbol == 'H':
-                piece_type = Hunter
+                piece_type = HUNTER
             elif piece_symbol == 'F':
-                piece_type = Falcon
+                piece_type = FALCON
             else:
                 return False
 
-            curr_captured = self.get_player('black').get_captured_pieces()
-
             # checks if major pieces captured > fairy pieces played, invalid if not
-            for piece in curr_captured:
-                if piece.get_symbol().lower() in replace_piece:
-                    major_pieces_cap_count += 1
+            major_pieces_cap_count = self._players[BLACK].get_major_caps()
 
             if major_pieces_cap_count > curr_player.get_fairy_played_count():
-                if (square.get_row() == 0 or square.get_row() == 1) and square.get_piece() is None:
-                    square.add_piece(piece_type('white'))
+                if (sq_row == 0 or sq_row == 1) and squares[sq_idx] == EMPTY:
+                    self._board.place_piece((WHITE << 4) | piece_type, sq_idx)
                     curr_player.remove_fairy_piece(piece_symbol.lower())
                     curr_player.inc_fairy_played_count()
                     self.get_game_state()
@@ -832,21 +862,18 @@ class ChessVar:
         # for black fairy piece entering play
         else:
             if piece_symbol == 'h':
-                piece_type = Hunter
+                piece_type = HUNTER
             elif piece_symbol == 'f':
-                piece_type = Falcon
+                piece_type = FALCON
             else:
                 return False
-            curr_captured = self.get_player('white').get_captured_pieces()
 
             # checks if major pieces captured > fairy pieces played, invalid if not
-            for piece in curr_captured:
-                if piece.get_symbol() in replace_piece:
-                    major_pieces_cap_count += 1
+            major_pieces_cap_count = self._players[WHITE].get_major_caps()
 
             if major_pieces_cap_count > curr_player.get_fairy_played_count():
-                if (square.get_row() == 7 or square.get_row() == 6) and square.get_piece() is None:
-                    square.add_piece(piece_type('black'))
+                if (sq_row == 7 or sq_row == 6) and squares[sq_idx] == EMPTY:
+                    self._board.place_piece((BLACK << 4) | piece_type, sq_idx)
                     curr_player.remove_fairy_piece(piece_symbol)
                     curr_player.inc_fairy_played_count()
                     self.get_game_state()